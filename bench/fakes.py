@@ -0,0 +1,143 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/fakes.py
+# Server pengganti lokal untuk Telegram Bot API dan toncenter (benchmark/offline).
+
+import asyncio
+import itertools
+import time
+from collections import Counter
+from typing import Optional
+
+from aiohttp import web
+
+
+class _FakeServer:
+    def __init__(self, latency_ms: float = 0.0):
+        self.latency = latency_ms / 1000
+        self.calls: Counter = Counter()
+        self._runner: Optional[web.AppRunner] = None
+        self.base_url = ""
+
+    def app(self) -> web.Application:
+        raise NotImplementedError
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        self._runner = web.AppRunner(self.app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.base_url = f"http://{host}:{port}"
+        return self.base_url
+
+    async def stop(self):
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _delay(self):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+
+
+class FakeBotAPI(_FakeServer):
+    """Bot API palsu: /bot<token>/<method> selalu sukses dengan payload minimal.
+
+    `member_status` menentukan jawaban getChatMember (mis. "member" / "left").
+    """
+
+    def __init__(self, latency_ms: float = 0.0, member_status: str = "member"):
+        super().__init__(latency_ms)
+        self.member_status = member_status
+        self._msg_ids = itertools.count(1)
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        self.calls[method] += 1
+        form = await request.post()
+        await self._delay()
+        return web.json_response({"ok": True, "result": self._result(method, form)})
+
+    def _result(self, method: str, form):
+        now = int(time.time())
+        if method in ("sendMessage", "sendDocument"):
+            chat_id = int(form.get("chat_id", 0))
+            return {
+                "message_id": next(self._msg_ids),
+                "date": now,
+                "chat": {"id": chat_id, "type": "private"},
+                "text": form.get("text", ""),
+            }
+        if method == "getChatMember":
+            uid = int(form.get("user_id", 0))
+            return {"status": self.member_status, "user": {"id": uid, "is_bot": False, "first_name": "u"}}
+        if method == "getMe":
+            return {"id": 42, "is_bot": True, "first_name": "BenchBot", "username": "bench_bot"}
+        if method == "getUpdates":
+            return []
+        return True
+
+
+class FakeToncenter(_FakeServer):
+    """toncenter palsu: getTransactions dengan paging lt/hash/to_lt seperti aslinya."""
+
+    def __init__(self, address: str, latency_ms: float = 0.0):
+        super().__init__(latency_ms)
+        self.address = address
+        self.txs: list[dict] = []  # terbaru di depan
+        self._lt = 1_000_000
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/v2/getTransactions", self.handle)
+        return app
+
+    def add_payment(self, comment: str, amount_ton: float, destination: Optional[str] = None) -> dict:
+        self._lt += 1
+        tx = {
+            "utime": int(time.time()),
+            "transaction_id": {"lt": str(self._lt), "hash": f"h{self._lt}"},
+            "in_msg": {
+                "source": "EQbenchpayer",
+                "destination": destination or self.address,
+                "value": str(int(amount_ton * 1_000_000_000)),
+                "message": comment,
+            },
+            "out_msgs": [],
+        }
+        self.txs.insert(0, tx)
+        return tx
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.calls["getTransactions"] += 1
+        q = request.query
+        limit = int(q.get("limit", 10))
+        start = 0
+        if q.get("lt") and q.get("hash"):
+            start = next(
+                (i for i, tx in enumerate(self.txs) if tx["transaction_id"]["lt"] == q["lt"]),
+                len(self.txs),
+            )
+        to_lt = int(q.get("to_lt", 0) or 0)
+        page = [tx for tx in self.txs[start:start + limit] if int(tx["transaction_id"]["lt"]) > to_lt]
+        await self._delay()
+        return web.json_response({"ok": True, "result": page})
@@ -0,0 +1,294 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# bench/loadtest.py
+# Load test offline: update sintetis diputar lewat Dispatcher asli bhinnekabot,
+# dengan Bot API & toncenter palsu. Hasil berupa JSON supaya bisa dibandingkan
+# antar commit.
+#
+#   python bench/loadtest.py --users 10000 --out bench_result.json
+#   python bench/loadtest.py --users 10000 --compare bench_result.json
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fakes import FakeBotAPI, FakeToncenter  # noqa: E402
+
+DEST = "EQbenchdestinationaddress"
+ADMIN_ID = 1
+
+
+def percentiles(samples: list[float]) -> dict:
+    if not samples:
+        return {"p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    s = sorted(samples)
+
+    def pick(q: float) -> float:
+        return round(s[min(len(s) - 1, int(q * len(s)))] * 1000, 3)
+
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": round(s[-1] * 1000, 3)}
+
+
+def git_commit() -> str:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        )
+        return out.stdout.strip()
+    except Exception:
+        return "unknown"
+
+
+class Harness:
+    def __init__(self, bb, concurrency: int):
+        self.bb = bb
+        self.concurrency = concurrency
+        self.by_command: dict[str, list[float]] = defaultdict(list)
+        self._update_ids = itertools.count(1)
+
+    def _user(self, uid: int) -> dict:
+        return {"id": uid, "is_bot": False, "first_name": f"User{uid}", "username": f"user{uid}"}
+
+    def message(self, uid: int, text: str) -> dict:
+        return {
+            "update_id": next(self._update_ids),
+            "message": {
+                "message_id": next(self._update_ids),
+                "date": int(time.time()),
+                "chat": {"id": uid, "type": "private"},
+                "from": self._user(uid),
+                "text": text,
+            },
+        }
+
+    def callback(self, uid: int, data: str) -> dict:
+        return {
+            "update_id": next(self._update_ids),
+            "callback_query": {
+                "id": f"cb{next(self._update_ids)}",
+                "from": self._user(uid),
+                "chat_instance": "bench",
+                "data": data,
+                "message": {"message_id": 1, "date": int(time.time()), "chat": {"id": uid, "type": "private"}},
+            },
+        }
+
+    async def phase(self, name: str, updates: list[tuple[str, dict]]) -> dict:
+        from aiogram.types import Update
+
+        bb = self.bb
+        sem = asyncio.Semaphore(self.concurrency)
+        latencies: list[float] = []
+        errors = 0
+        commits0 = bb.dbgw.commits
+
+        async def one(label: str, raw: dict):
+            nonlocal errors
+            async with sem:
+                update = Update.model_validate(raw, context={"bot": bb.bot})
+                t0 = time.perf_counter()
+                try:
+                    await bb.dp.feed_update(bb.bot, update)
+                except Exception:
+                    errors += 1
+                dt = time.perf_counter() - t0
+                latencies.append(dt)
+                self.by_command[label].append(dt)
+
+        t0 = time.perf_counter()
+        await asyncio.gather(*(one(label, raw) for label, raw in updates))
+        elapsed = time.perf_counter() - t0
+        result = {
+            "count": len(updates),
+            "errors": errors,
+            "seconds": round(elapsed, 3),
+            "throughput_per_s": round(len(updates) / elapsed, 1) if elapsed else 0.0,
+            "latency_ms": percentiles(latencies),
+            "db_commits": bb.dbgw.commits - commits0,
+        }
+        logging.getLogger("bench").warning(
+            "%-12s n=%-6d %.2fs %8.1f/s p95=%.1fms commits=%d",
+            name, result["count"], elapsed, result["throughput_per_s"],
+            result["latency_ms"]["p95"], result["db_commits"],
+        )
+        return result
+
+
+async def run(args) -> dict:
+    tg = FakeBotAPI(latency_ms=args.api_latency_ms)
+    ton = FakeToncenter(DEST, latency_ms=args.api_latency_ms)
+    tg_url = await tg.start()
+    ton_url = await ton.start()
+    workdir = tempfile.mkdtemp(prefix="bhek-bench-")
+    os.environ.update(
+        BOT_TOKEN="42:BENCH",
+        TON_DEST_ADDRESS=DEST,
+        OFFICIAL_ONLY="0",
+        ADMINS=str(ADMIN_ID),
+        TELEGRAM_API_SERVER=tg_url,
+        TONCENTER_API=f"{ton_url}/api/v2",
+        TONCENTER_API_KEY="",
+        TONCENTER_RPS="1000",
+        DB_PATH=os.path.join(workdir, "bench.db"),
+        SNAPSHOT_DIR=os.path.join(workdir, "snapshots"),  # jangan restore snapshot dari cwd
+        STORAGE_BACKEND=args.storage,
+    )
+    import bhinnekabot as bb  # env harus siap sebelum import
+
+    logging.getLogger().setLevel(logging.WARNING)
+    await bb.on_startup()
+    h = Harness(bb, args.concurrency)
+    users = list(range(1000, 1000 + args.users))
+    phases: dict[str, dict] = {}
+    watcher: dict = {}
+    try:
+        phases["start"] = await h.phase("start", [("/start", h.message(u, "/start")) for u in users])
+        phases["claim_storm"] = await h.phase("claim_storm", [("/claim", h.message(u, "/claim")) for u in users])
+        readers = users[: max(1, args.users // 10)]
+        mixed = []
+        for u in readers:
+            mixed += [
+                ("/leaderboard", h.message(u, "/leaderboard")),
+                ("/rank", h.message(u, "/rank")),
+                ("/points", h.message(u, "/points")),
+                ("/status", h.message(u, "/status")),
+            ]
+        phases["read_mix"] = await h.phase("read_mix", mixed)
+
+        # penyerang spam /premium & command asal bersamaan dengan user normal: throttle harus
+        # membuang spam tanpa menaikkan latensi user normal
+        attackers = users[-5:]
+        spam = [("spam", h.message(u, cmd)) for _ in range(200) for u in attackers for cmd in ("/premium", "/xyz")]
+        normal = [("/points", h.message(u, "/points")) for u in readers]
+        dropped0 = dict(bb.throttle_middleware.dropped)
+        phases["spam"] = await h.phase("spam", spam + normal)
+        phases["spam"]["dropped"] = {
+            k: v - dropped0.get(k, 0) for k, v in bb.throttle_middleware.dropped.items()
+        }
+        phases["spam"]["normal_latency_ms"] = percentiles(h.by_command["/points"][-len(normal):])
+
+        buyers = users[: max(1, min(args.users, args.buyers))]
+        phases["premium"] = await h.phase("premium", [("/premium", h.message(u, "/premium")) for u in buyers])
+        orders = await bb.storage.pending_orders()
+        injected = {}
+        for oid, _, code, amount, _ in orders:
+            ton.add_payment(code, amount)
+            injected[oid] = time.monotonic()
+        lags: list[float] = []
+        deadline = time.monotonic() + args.watch_timeout
+        while injected and time.monotonic() < deadline:
+            still_pending = {oid for oid, *_ in await bb.storage.pending_orders()}
+            now = time.monotonic()
+            for oid in list(injected):
+                if oid not in still_pending:
+                    lags.append(now - injected.pop(oid))
+            await asyncio.sleep(0.1)
+        lag = percentiles(lags)
+        watcher = {
+            "orders": len(orders),
+            "confirmed": len(lags),
+            "unconfirmed": len(injected),
+            "lag_s": {k: round(v / 1000, 3) for k, v in lag.items()},
+            "toncenter_calls": ton.calls["getTransactions"],
+        }
+        phases["check_payment"] = await h.phase(
+            "check_payment", [("check_payment", h.callback(u, "check_payment")) for u in buyers]
+        )
+    finally:
+        await bb.on_shutdown()
+        await tg.stop()
+        await ton.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": int(time.time()),
+            "python": platform.python_version(),
+            "users": args.users,
+            "buyers": args.buyers,
+            "concurrency": args.concurrency,
+            "api_latency_ms": args.api_latency_ms,
+            "storage": args.storage,
+        },
+        "phases": phases,
+        "commands": {
+            cmd: {"count": len(s), "latency_ms": percentiles(s)} for cmd, s in sorted(h.by_command.items())
+        },
+        "watcher": watcher,
+        "bot_api_calls": dict(tg.calls),
+        "db_commits_total": bb.dbgw.commits,
+    }
+
+
+def compare(old: dict, new: dict):
+    print(f"\n{'phase':<14}{'p95 ms (old → new)':>28}{'throughput/s (old → new)':>34}{'commits':>18}")
+    for name, cur in new.get("phases", {}).items():
+        prev = old.get("phases", {}).get(name)
+        if not prev:
+            continue
+        p_old, p_new = prev["latency_ms"]["p95"], cur["latency_ms"]["p95"]
+        t_old, t_new = prev["throughput_per_s"], cur["throughput_per_s"]
+        pct = ((p_new - p_old) / p_old * 100) if p_old else 0.0
+        print(
+            f"{name:<14}{p_old:>12.1f} → {p_new:<8.1f}({pct:+.0f}%)"
+            f"{t_old:>16.1f} → {t_new:<12.1f}{prev['db_commits']:>8} → {cur['db_commits']}"
+        )
+    o, n = old.get("watcher", {}).get("lag_s", {}), new.get("watcher", {}).get("lag_s", {})
+    if o and n:
+        print(f"{'watcher lag':<14}{o['p95']:>12.2f}s → {n['p95']:.2f}s (p95)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Offline load test BhinnekaBot")
+    ap.add_argument("--users", type=int, default=10_000)
+    ap.add_argument("--buyers", type=int, default=200, help="jumlah user yang /premium + bayar")
+    ap.add_argument("--concurrency", type=int, default=500, help="update yang diproses bersamaan")
+    ap.add_argument("--api-latency-ms", type=float, default=0.0, help="latensi buatan Bot API/toncenter")
+    ap.add_argument("--watch-timeout", type=float, default=90.0, help="batas tunggu konfirmasi watcher (detik)")
+    ap.add_argument("--storage", default="sqlite", choices=("sqlite", "memory", "postgres"),
+                    help="STORAGE_BACKEND (postgres butuh DATABASE_URL di env)")
+    ap.add_argument("--out", help="tulis hasil JSON ke file ini")
+    ap.add_argument("--compare", help="bandingkan dengan hasil JSON sebelumnya")
+    args = ap.parse_args()
+
+    result = asyncio.run(run(args))
+    text = json.dumps(result, indent=2, sort_keys=True)
+    if args.out:
+        Path(args.out).write_text(text + "\n")
+    else:
+        print(text)
+    if args.compare:
+        compare(json.loads(Path(args.compare).read_text()), result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# tests/test_bulk_give.py
+# Bulk /give yang terhenti di antara chunk dilanjutkan tanpa poin dobel.
+
+import json
+
+import pytest
+
+from conftest import bb, open_storage, run
+
+NOW = 1_700_000_000
+CSV = "user_id,amount,reason\n" + "".join(f"{uid},{uid * 10},event\n" for uid in range(1, 6))
+
+
+class Killed(Exception):
+    pass
+
+
+def test_resume_after_kill_between_chunks(backend, tmp_path, monkeypatch):
+    monkeypatch.setattr(bb, "BULK_GIVE_CHUNK", 2)
+    grant = bb.grant_points_bulk
+    calls = 0
+
+    async def grant_then_die(grants, progress=None):
+        nonlocal calls
+        await grant(grants, progress)
+        calls += 1
+        if calls == 2:
+            raise Killed  # proses mati tepat setelah chunk kedua commit
+
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            monkeypatch.setattr(bb, "storage", st)
+            key = "bulk_give:test"
+            monkeypatch.setattr(bb, "grant_points_bulk", grant_then_die)
+            with pytest.raises(Killed):
+                await bb.bulk_give(CSV, NOW, key)
+            state = json.loads(await st.job_state(key))
+            assert state == {"status": "partial", "line": 5}
+            assert sorted(await st.all_points()) == [(1, 10), (2, 20), (3, 30), (4, 40)]
+
+            monkeypatch.setattr(bb, "grant_points_bulk", grant)
+            summary, rejected = await bb.bulk_give(CSV, NOW, key, resume_after=state["line"])
+            assert (summary["applied"], rejected) == (1, [])
+            assert sorted(await st.all_points()) == [(uid, uid * 10) for uid in range(1, 6)]
+            assert await st.points_mismatches() == []
+
+    run(scenario())
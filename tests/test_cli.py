@@ -0,0 +1,43 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# tests/test_cli.py
+# Hanya subcommand yang dikenal yang boleh jalan tanpa BOT_TOKEN.
+
+import os
+import subprocess
+import sys
+
+from conftest import ROOT, bb
+
+
+def _cli(*args: str) -> subprocess.CompletedProcess:
+    env = {k: v for k, v in os.environ.items() if k not in ("BOT_TOKEN", "TON_DEST_ADDRESS")}
+    return subprocess.run([sys.executable, str(ROOT / "bhinnekabot.py"), *args],
+                          env=env, capture_output=True, text=True, timeout=60)
+
+
+def test_unknown_subcommand_is_rejected():
+    res = _cli("snapshto")
+    assert res.returncode == 2
+    assert "subcommand tidak dikenal: 'snapshto'" in res.stderr
+    assert "BOT_TOKEN" not in res.stderr
+
+
+def test_known_subcommands_match_the_parser():
+    res = _cli("--help")
+    assert res.returncode == 0
+    assert "{" + ",".join(bb.CLI_COMMANDS) + "}" in res.stdout
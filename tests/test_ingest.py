@@ -0,0 +1,103 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# tests/test_ingest.py
+# ingest_ton_transactions: walk yang terpotong TON_INGEST_MAX_PAGES dilanjut siklus
+# berikutnya tanpa transaksi yang hilang atau dobel. toncenter diganti chain di memori.
+
+import json
+import time
+
+from conftest import bb, run
+
+
+class FakeChain:
+    """getTransactions dengan paging lt/hash/to_lt seperti toncenter (terbaru di depan)."""
+
+    def __init__(self):
+        self.txs: list[dict] = []
+        self.calls = 0
+        self._lt = 1000
+
+    def pay(self, comment: str, destination: str = ""):
+        self._lt += 1
+        self.txs.insert(0, {
+            "utime": int(time.time()),
+            "transaction_id": {"lt": str(self._lt), "hash": f"h{self._lt}"},
+            "in_msg": {
+                "source": "EQpayer",
+                "destination": destination or bb.TON_DEST,
+                "value": "1000000000",
+                "message": comment,
+            },
+        })
+
+    async def get_transactions(self, address, limit=20, lt=None, tx_hash=None, to_lt=None):
+        self.calls += 1
+        start = 0
+        if lt and tx_hash:
+            start = next((i for i, tx in enumerate(self.txs) if int(tx["transaction_id"]["lt"]) == int(lt)),
+                         len(self.txs))
+        page = self.txs[start:start + limit]
+        return {"ok": True, "result": [tx for tx in page if int(tx["transaction_id"]["lt"]) > (to_lt or 0)]}
+
+
+async def _comments() -> list[str]:
+    async with bb.dbgw.read() as db:
+        cur = await db.execute("SELECT comment FROM ton_txs ORDER BY lt")
+        return [r[0] for r in await cur.fetchall()]
+
+
+def test_ingest_resumes_across_max_pages(tmp_path, monkeypatch):
+    chain = FakeChain()
+    gw = bb.DBGateway(str(tmp_path / "ingest.db"), readers=1)
+    monkeypatch.setattr(bb, "dbgw", gw)
+    monkeypatch.setattr(bb, "storage", bb.SQLiteStorage(gw))
+    monkeypatch.setattr(bb, "ton_get_transactions", chain.get_transactions)
+    monkeypatch.setattr(bb, "TON_INGEST_PAGE", 5)
+    monkeypatch.setattr(bb, "TON_INGEST_MAX_PAGES", 2)
+
+    async def scenario():
+        await gw.start()
+        try:
+            await bb.init_db()
+            for i in range(22):
+                chain.pay(f"C{i}")
+            chain.pay("X", destination="EQsomeoneelse")  # bukan ke TON_DEST: dilewati
+
+            # 2 halaman x 5 (halaman lanjutan diawali transaksi posisi terakhir) = 9 transaksi
+            assert await bb.ingest_ton_transactions() == 8
+            walk = json.loads(await bb.meta_get("ton_walk"))
+            assert walk["top"]["lt"] == 1023
+
+            chain.pay("LATE")  # masuk di tengah walk: diambil setelah walk sampai ujung
+            total = 8
+            for _ in range(5):
+                n = await bb.ingest_ton_transactions()
+                total += n
+                if n == 0 and await bb.meta_get("ton_walk") is None:
+                    break
+            assert total == 23
+            assert await _comments() == [f"C{i}" for i in range(22)] + ["LATE"]
+            assert json.loads(await bb.meta_get("ton_cursor"))["lt"] == 1024
+
+            calls = chain.calls
+            assert await bb.ingest_ton_transactions() == 0
+            assert chain.calls == calls + 1  # cursor terbaru: satu halaman kosong saja
+        finally:
+            await gw.close()
+
+    run(scenario())
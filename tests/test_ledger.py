@@ -0,0 +1,69 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# tests/test_ledger.py
+# PointsLedger (group commit poin) di atas tiap backend Storage.
+
+import asyncio
+
+from conftest import bb, open_storage, run
+
+NOW = 1_700_000_000
+DAY = "2023-11-14"
+
+
+def test_duplicate_claims_in_one_batch(backend, tmp_path):
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            for uid in (1, 2, 3):
+                await st.save_user(uid, f"u{uid}", "U", NOW, None)
+            ledger = bb.PointsLedger(st, flush_ms=50, batch_max=100)
+            ledger.start()
+            try:
+                res = await asyncio.gather(
+                    ledger.add(1, 10, "daily_claim", False, claim_day=DAY),
+                    ledger.add(1, 10, "daily_claim", False, claim_day=DAY),  # double tap
+                    ledger.add(2, 10, "daily_claim", False, claim_day=DAY),
+                    ledger.add(3, 5, "bonus", True),
+                )
+            finally:
+                await ledger.close()
+            assert res == [10, None, 10, None]
+            assert ledger.batches == 1
+            assert await st.count_claims(1) == 1
+            assert sorted(await st.all_points()) == [(1, 10), (2, 10), (3, 5)]
+            assert await st.points_mismatches() == []
+
+    run(scenario())
+
+
+def test_close_flushes_pending_entries(backend, tmp_path):
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            await st.save_user(1, "u1", "U", NOW, None)
+            # jendela flush sangat panjang: hanya close() yang bisa meng-commit entri ini
+            ledger = bb.PointsLedger(st, flush_ms=60_000, batch_max=100)
+            ledger.start()
+            pending = [asyncio.create_task(ledger.add(1, 7, "bonus", False)) for _ in range(3)]
+            await asyncio.sleep(0.05)
+            assert not any(t.done() for t in pending)
+            await ledger.close()
+            assert all(t.done() for t in pending)
+            assert ledger.batches == 1
+            assert sorted(await st.all_points()) == [(1, 21)]
+            await ledger.settle(1)  # tidak ada yang tersisa untuk ditunggu
+
+    run(scenario())
@@ -0,0 +1,70 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# tests/test_payment_check.py
+# Tombol cek pembayaran selama siklus watcher berjalan tidak menambah request toncenter.
+
+import asyncio
+import json
+import time
+
+from conftest import bb, run
+
+
+def test_click_during_cycle_shares_the_newest_page(tmp_path, monkeypatch):
+    gw = bb.DBGateway(str(tmp_path / "check.db"), readers=1)
+    st = bb.SQLiteStorage(gw)
+    monkeypatch.setattr(bb, "dbgw", gw)
+    monkeypatch.setattr(bb, "storage", st)
+    monkeypatch.setattr(bb, "_ton_head", (0.0, []))
+    client = bb.TonClient("http://toncenter.invalid", rps=100)
+    monkeypatch.setattr(bb, "ton_client", client)
+    requests = []
+    tx = {
+        "utime": int(time.time()),
+        "transaction_id": {"lt": "2000", "hash": "h2000"},
+        "in_msg": {"source": "EQpayer", "destination": bb.TON_DEST, "value": "1000000000", "message": "PAYCODE"},
+    }
+
+    async def slow_request(method, params):
+        requests.append(params)
+        await asyncio.sleep(0.05)
+        return {"ok": True, "result": [tx]}
+
+    monkeypatch.setattr(client, "_request", slow_request)
+    watcher = bb.PremiumWatcher(0, 1, 1, 60)
+
+    async def scenario():
+        await gw.start()
+        try:
+            await bb.init_db()
+            await st.save_user(1, "u1", "U", int(time.time()), None)
+            await st.create_order(1, "PAYCODE", 1.0, int(time.time()))
+            async with gw.write() as db:  # cursor lama: walk baru tetap tanpa to_lt
+                await bb.meta_set(db, "ton_cursor", json.dumps({"lt": 1500, "hash": "h1500"}))
+
+            cycle = asyncio.ensure_future(watcher.cycle())
+            await asyncio.sleep(0.01)  # klik saat halaman pertama siklus sedang diambil
+            await watcher.verify_user(1, max_age=5)
+            await cycle
+            assert len(requests) == 1
+            assert await st.pending_orders_of(1) == []
+            assert not await watcher.verify_user(1, max_age=5)  # tidak ada order lagi
+            assert len(requests) == 1
+        finally:
+            await gw.close()
+
+    run(scenario())
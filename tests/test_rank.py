@@ -0,0 +1,65 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+
+# tests/test_rank.py
+# RankIndex: urutan (points DESC, user_id ASC) harus sama dengan top_points di DB.
+
+import random
+
+import pytest
+
+from conftest import bb
+
+
+def test_rank_and_tie_ordering():
+    idx = bb.RankIndex()
+    idx.load([(5, 10), (3, 10), (9, 20), (1, 0)])
+    assert idx.page(0, 10) == [(9, 20), (3, 10), (5, 10), (1, 0)]
+    assert [idx.rank(u) for u in (9, 3, 5, 1)] == [1, 2, 3, 4]
+
+    idx.set(5, 20)  # seri di puncak: user_id kecil duluan
+    assert idx.page(0, 2) == [(5, 20), (9, 20)]
+    idx.apply({1: 15, 42: 7})  # 42 belum terdaftar: diabaikan
+    assert idx.rank(1) == 3 and idx.rank(42) is None
+    assert idx.page(3, 10) == [(3, 10)]
+
+
+def test_large_user_ids():
+    idx = bb.RankIndex()
+    big = (1 << 52) + 12345  # di atas 2^44, masih dalam rentang user_id Telegram
+    idx.load([(big, 5), (7, 5)])
+    assert idx.page(0, 2) == [(7, 5), (big, 5)]
+    idx.set(big, 6)
+    assert idx.rank(big) == 1 and idx.score(big) == 6
+    with pytest.raises(ValueError):
+        idx.set(1 << bb.RankIndex._UID_BITS, 1)
+    assert len(idx) == 2
+
+
+def test_matches_sorted_reference():
+    rnd = random.Random(7)
+    idx = bb.RankIndex()
+    idx.LOAD = 4  # bucket kecil supaya split dan Fenwick ikut teruji
+    idx.load([(uid, rnd.randint(0, 20)) for uid in range(1, 200)])
+    scores = {uid: idx.score(uid) for uid in range(1, 200)}
+    for _ in range(2000):
+        uid = rnd.randint(1, 260)
+        scores[uid] = rnd.randint(0, 20)
+        idx.set(uid, scores[uid])
+    ref = sorted(scores.items(), key=lambda kv: (-kv[1], kv[0]))
+    assert idx.page(0, len(ref)) == ref
+    assert idx.page(37, 11) == ref[37:48]
+    assert all(idx.rank(uid) == pos for pos, (uid, _) in enumerate(ref, 1))
@@ -0,0 +1,128 @@
+# SPDX-License-Identifier: Apache-2.0
+# Copyright 2025 Endi Hariadi
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+# tests/test_storage.py
+# Skenario yang sama dijalankan ke semua backend Storage (memory, sqlite, postgres).
+
+import json
+
+from conftest import open_storage, run
+
+NOW = 1_700_000_000
+DAY = "2023-11-14"
+
+
+def test_users_points_and_claims(backend, tmp_path):
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            await st.save_user(10, "Alice", "A", NOW, None)
+            await st.save_user(11, "bob", "B", NOW, None)
+            assert await st.count_users() == 2
+            assert await st.user_id_by_username("alice") == 10
+
+            # username pindah tangan: pemilik lama dilepas
+            await st.save_user(11, "ALICE", "B", NOW, None)
+            assert await st.user_id_by_username("alice") == 11
+            assert (await st.usernames([10]))[10] == ""
+
+            claim = (10, 10, "daily", 0, NOW, DAY)
+            res = await st.apply_points([(11, 5, "bonus", 1, NOW)], [claim, claim])
+            assert res == [10, None]  # double tap di batch yang sama
+            assert await st.apply_points([], [claim]) == [None]
+            assert await st.has_claim(10, DAY) and await st.count_claims(10) == 1
+            assert sorted(await st.all_points()) == [(10, 10), (11, 5)]
+
+            await st.grant_points([(10, 3, "grant", 1, NOW), (12, 7, "grant", 1, NOW)])
+            profile, _ = await st.load_profile(12, 3)
+            assert profile[3] == 7
+            assert await st.points_mismatches() == []
+
+    run(scenario())
+
+
+def test_referrals(backend, tmp_path):
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            await st.save_user(1, "ref", "R", NOW, None)
+            assert await st.add_referred_user(2, "n2", "N", NOW, 1, 20)
+            assert not await st.add_referred_user(2, "n2", "N", NOW, 1, 20)  # sudah ada
+            assert await st.add_referred_user(3, "n3", "N", NOW, 1, 20)
+            assert await st.referral_stats(1) == (2, 40)
+            assert await st.top_referrers(5) == [(1, 2, 40)]
+            profile, _ = await st.load_profile(1, 0)
+            assert profile[3] == 40
+
+    run(scenario())
+
+
+def test_orders_confirm_and_outbox(backend, tmp_path):
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            for uid in (1, 2):
+                await st.save_user(uid, f"u{uid}", "U", NOW, None)
+            await st.set_premium(1, NOW + 1000)
+            o1 = await st.create_order(1, "C1", 1.0, NOW)
+            o2 = await st.create_order(2, "C2", 1.0, NOW)
+            assert [o[0] for o in await st.pending_orders()] == [o1, o2]
+
+            confirmed = await st.confirm_orders([(o1, 1), (o2, 2), (o1, 1)], NOW, 100)
+            assert confirmed == [(o1, 1, NOW + 1100), (o2, 2, NOW + 100)]
+            assert await st.confirm_orders([(o1, 1)], NOW, 100) == []
+            assert await st.pending_orders() == []
+
+            rows = await st.outbox_claim(NOW, 10, 60)
+            assert [(r[1], r[2], json.loads(r[3])["order_id"]) for r in rows] == [
+                (1, "premium_confirmed", o1), (2, "premium_confirmed", o2)]
+            assert await st.outbox_claim(NOW + 59, 10, 60) == []
+            await st.outbox_ack(rows[0][0])
+            await st.outbox_retry(rows[1][0], NOW + 500, 1, "boom")
+            again = await st.outbox_claim(NOW + 500, 10, 60)
+            assert [(r[0], r[4]) for r in again] == [(rows[1][0], 1)]
+            await st.outbox_retry(rows[1][0], NOW, 2, "blocked", dead=True)
+            assert await st.outbox_claim(NOW + 10_000, 10, 60) == []
+
+    run(scenario())
+
+
+def test_poller_lease(backend, tmp_path):
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            assert await st.acquire_lease("poller", "a", NOW, 60)
+            assert not await st.acquire_lease("poller", "b", NOW + 10, 60)
+            assert await st.acquire_lease("poller", "a", NOW + 20, 60)
+            await st.release_lease("poller", "b")  # bukan pemilik: tidak berpengaruh
+            assert not await st.acquire_lease("poller", "b", NOW + 30, 60)
+            await st.release_lease("poller", "a")
+            assert await st.acquire_lease("poller", "b", NOW + 31, 60)
+            assert await st.acquire_lease("poller", "a", NOW + 200, 60)  # kedaluwarsa
+
+    run(scenario())
+
+
+def test_outbox_reclaim_after_lease(backend, tmp_path):
+    async def scenario():
+        async with open_storage(backend, tmp_path) as st:
+            await st.save_user(1, "u1", "U", NOW, None)
+            await st.outbox_enqueue([(1, "premium_reminder", {"until": NOW, "label": "3 hari"})], NOW)
+            first = [tuple(r) for r in await st.outbox_claim(NOW, 10, 60)]
+            assert [(r[1], r[2], r[4]) for r in first] == [(1, "premium_reminder", 0)]
+            assert await st.outbox_claim(NOW + 59, 10, 60) == []  # lease masih dipegang worker
+            # worker mati tanpa ack/retry: baris yang sama muncul lagi, attempts tidak bertambah
+            again = [tuple(r) for r in await st.outbox_claim(NOW + 60, 10, 60)]
+            assert again == first
+            await st.outbox_ack(again[0][0])
+            assert await st.outbox_claim(NOW + 10_000, 10, 60) == []
+
+    run(scenario())